@@ -16,7 +16,8 @@ type Point = {
   cluster: number | null;
   score?: number;
   subreddit?: string;
-  embedding?: number[];
+  embedding?: string | null;
+  embedding_scale?: number | null;
   is_user_stance?: boolean;
   similarity_to_user?: number;
 }
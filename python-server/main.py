@@ -1,26 +1,48 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
-import praw
 import re
+import base64
+import binascii
 import requests
 from requests.auth import HTTPBasicAuth
 from sentence_transformers import SentenceTransformer
 from sklearn.decomposition import PCA
-from sklearn.manifold import TSNE
+from openTSNE import TSNE
+from openTSNE.affinity import PerplexityBasedNN
+from openTSNE.nearest_neighbors import PrecomputedNeighbors
 from sklearn.cluster import KMeans
 import hdbscan
 import umap
 import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
 import logging
 import asyncio
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import httpx
+import orjson
+import xxhash
 import time
-from time import sleep
+import threading
+import warnings
 import os
+import platform
 import google.generativeai as genai
-import threading
+from cachetools import LRUCache, TTLCache
+import diskcache
+import torch
+
+try:
+    import faiss  # KMeans and large-input range search; faiss-cpu, or a GPU build if installed
+except ImportError:
+    faiss = None
+
+try:
+    from cuml.manifold import UMAP as cuUMAP  # GPU UMAP from RAPIDS, when installed
+except ImportError:
+    cuUMAP = None
 
 # Fix tokenizers parallelism warning
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
@@ -28,8 +50,28 @@ os.environ["TOKENIZERS_PARALLELISM"] = "false"
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
-REDDIT_COMMENT_LIMIT = 20
-REDDIT_SLEEP_TIME = 15
+REDDIT_BASE_URL = "https://www.reddit.com"
+REDDIT_USER_AGENT = "opinion-visualizer/1.0"
+REDDIT_SLEEP_TIME = 15  # Backoff after a 429 that carries no Retry-After header
+REDDIT_MAX_RETRIES = 3  # Retries of a rate-limited request before giving up on it
+REDDIT_SCRAPE_TIMEOUT = 30  # Seconds per subreddit; opinions collected so far are kept
+REDDIT_COMMENT_LIMIT = 2  # Top comments fetched per submission
+SUPPLEMENTAL_SUBREDDITS = ['politics', 'changemyview', 'news']  # Searched when r/all yields too little
+REDDIT_MAX_CONCURRENCY = 10
+REDDIT_MAX_CONNECTIONS = 32
+REDDIT_MAX_KEEPALIVE = 16
+REDDIT_KEEPALIVE_EXPIRY = 120  # Seconds an idle pooled connection is kept open
+HDBSCAN_MIN_POINTS = 30  # Below this, HDBSCAN mostly yields noise and falls back to KMeans anyway
+UMAP_MIN_POINTS = 50  # Below this, PCA is faster and less noisy than UMAP
+RESULT_CACHE_TTL = 600  # Seconds a processed topic is served from cache
+SIMILARITY_DENSE_MAX_POINTS = 2048  # Above this, group via faiss range search instead of an n x n matrix
+KNN_EXACT_MAX_POINTS = 2048  # Above this, reducers build their own approximate kNN instead of an n x n GEMM
+EMBED_BATCH_SIZE = 64
+EMBED_MODEL_NAME = 'all-MiniLM-L6-v2'
+EMBED_DEVICE = 'cuda' if torch.cuda.is_available() else 'cpu'
+EMBED_CACHE_DIR = '/tmp/emb_cache'
+EMBED_CACHE_SIZE_LIMIT = 2**30  # Bytes of float16 vectors kept on disk
+EMBED_MAX_SEQ_LENGTH = 128  # clean_text caps opinions at 500 chars, roughly 100-120 word pieces
 
 # Configure Gemini AI
 # Note: Set GEMINI_API_KEY environment variable with your API key
@@ -40,7 +82,23 @@ if gemini_api_key:
 else:
     logging.warning("GEMINI_API_KEY not found. Topic extraction will not be available.")
 
-app = FastAPI()
+gemini_model = genai.GenerativeModel('gemini-1.5-flash')
+
+# Gemini topic extractions by input sentence, so repeated queries skip the API call
+topic_cache = LRUCache(maxsize=1024)
+
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Processed topics, so repeated requests skip scraping and the whole pipeline
+result_cache = TTLCache(maxsize=128, ttl=RESULT_CACHE_TTL)
+
+# kNN graphs by embedding contents, so switching reductions reuses the neighbor search
+knn_cache = LRUCache(maxsize=32)
+knn_cache_lock = threading.Lock()  # Filled from reduction worker threads
+
+# umap-learn warns on every fit with a precomputed kNN that carries no search index;
+# we never call transform, which is all the index would be needed for
+warnings.filterwarnings("ignore", message=r"precomputed_knn\[2\]", module="umap")
 
 # Add CORS middleware
 app.add_middleware(
@@ -51,22 +109,62 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
+def select_onnx_file() -> str:
+    """
+    Pick the dynamically quantized ONNX export of the model that matches this
+    CPU's vector instructions (VNNI int8 dot products where available).
+    """
+    if platform.machine().lower() in ('arm64', 'aarch64'):
+        return 'onnx/model_qint8_arm64.onnx'
+    try:
+        with open('/proc/cpuinfo') as f:
+            cpu_flags = f.read()
+    except OSError:
+        cpu_flags = ''
+    if 'avx512_vnni' in cpu_flags:
+        return 'onnx/model_qint8_avx512_vnni.onnx'
+    if 'avx512f' in cpu_flags:
+        return 'onnx/model_qint8_avx512.onnx'
+    return 'onnx/model_quint8_avx2.onnx'
+
+def load_embedding_model() -> SentenceTransformer:
+    """
+    Load the sentence encoder: FP16 on CUDA, dynamic INT8 ONNX Runtime on CPU.
+    Falls back to the FP32 PyTorch model if the ONNX backend is not installed.
+    """
+    if EMBED_DEVICE == 'cuda':
+        logging.info("CUDA available, loading embedding model in FP16")
+        return SentenceTransformer(EMBED_MODEL_NAME, device=EMBED_DEVICE).half()
+    
+    try:
+        onnx_file = select_onnx_file()
+        encoder = SentenceTransformer(
+            EMBED_MODEL_NAME,
+            backend='onnx',
+            model_kwargs={'file_name': onnx_file},
+        )
+        logging.info(f"Loaded INT8 ONNX embedding model from {onnx_file}")
+        return encoder
+    except Exception as e:
+        logging.warning(f"ONNX backend unavailable ({e}), using FP32 PyTorch embedding model")
+        return SentenceTransformer(EMBED_MODEL_NAME)
 
-reddit = praw.Reddit(
-    client_id="5rzQzUlLbtJlx2yZzQ84jQ",
-    client_secret="JR14CdovObLA9eTF6oEZX_VHw9S5MQ", 
-    user_agent="opinion-visualizer/1.0",
-    check_for_async=False
-)
+embed_model = load_embedding_model()
+embed_model.max_seq_length = EMBED_MAX_SEQ_LENGTH
+
+# Embeddings of previously seen opinions, keyed by model name and a hash of the cleaned text
+embedding_cache = diskcache.Cache(EMBED_CACHE_DIR, size_limit=EMBED_CACHE_SIZE_LIMIT)
 
 
 class ProcessRequest(BaseModel):
     topic: str  # Input sentence or topic - will automatically extract key topic using AI
-    reduction: Optional[str] = "tsne"  # "tsne", "umap", "pca"
-    clustering_method: Optional[str] = "kmeans"  # "kmeans", "hdbscan"
+    reduction: Optional[str] = "pca"  # "tsne", "umap", "pca"
+    clustering_method: Optional[str] = "kmeans"  # "kmeans", "hdbscan", "similarity"
     n_clusters: Optional[int] = 5  # Number of clusters for KMeans (ignored for HDBSCAN)
+    similarity_threshold: Optional[float] = 0.7  # Cosine threshold for "similarity" grouping
     max_posts: Optional[int] = 50
+    include_embeddings: Optional[bool] = False  # Return each point's full embedding as base64 int8
+    deterministic: Optional[bool] = False  # Seed UMAP for reproducible (but single-threaded) layouts
 
 class TopicExtractionRequest(BaseModel):
     sentence: str
@@ -79,7 +177,8 @@ class Point(BaseModel):
     cluster: Optional[int] = None  
     score: Optional[int] = None
     subreddit: Optional[str] = None
-    embedding: Optional[List[float]] = None
+    embedding: Optional[str] = None  # Base64 int8 vector, see pack_embedding
+    embedding_scale: Optional[float] = None  # int8 values * embedding_scale recovers the float vector
     is_user_stance: Optional[bool] = False  # Mark if this is a user-submitted stance
     similarity_to_user: Optional[float] = None  # Similarity to user stance if applicable
 
@@ -103,9 +202,11 @@ async def extract_key_topic(sentence: str) -> str:
     if not gemini_api_key:
         raise HTTPException(status_code=503, detail="Gemini API key not configured")
     
+    cached_topic = topic_cache.get(sentence)
+    if cached_topic is not None:
+        return cached_topic
+    
     try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
         prompt = f"""
 Extract the main topic or subject from this sentence in 1-3 words maximum. Focus on the central theme or issue being discussed.
 
@@ -121,7 +222,7 @@ Sentence: "{sentence}"
 
 Main topic:"""
         
-        response = model.generate_content(prompt)
+        response = await gemini_model.generate_content_async(prompt)
         extracted_topic = response.text.strip().lower()
         
         # Clean up the response
@@ -129,6 +230,7 @@ Main topic:"""
         extracted_topic = extracted_topic.replace('"', '').replace("'", "")
         
         logging.info(f"Extracted topic '{extracted_topic}' from sentence: {sentence[:50]}...")
+        topic_cache[sentence] = extracted_topic
         return extracted_topic
         
     except Exception as e:
@@ -166,104 +268,166 @@ def extract_topic_fallback(sentence: str) -> str:
         return ' '.join(words[:2])
     return sentence_lower[:20]
 
-def clean_text(text: str) -> str:
+_URL_RE = re.compile(r'https?://\S+')
+_WS_RE = re.compile(r'\s+')
+
+def clean_text(text: str) -> Optional[str]:
     """Clean and preprocess Reddit text."""
-    # Remove URLs
-    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
-    # Remove Reddit formatting
-    text = re.sub(r'\n+', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
-    # Remove very short or very long texts
-    if len(text.strip()) < 20 or len(text.strip()) > 500:
+    # Cleaning only ever shortens text, so short inputs can be rejected up front
+    if len(text) < 20:
         return None
-    return text.strip()
+    # Remove URLs; most texts have none, and a substring check is far cheaper than a regex scan
+    if 'http' in text:
+        text = _URL_RE.sub('', text)
+    # Collapse newlines and other Reddit formatting whitespace
+    text = _WS_RE.sub(' ', text).strip()
+    # Remove very short or very long texts
+    return text if 20 <= len(text) <= 500 else None
 
-def parse_reddit_submission(submission, subreddit_name, opinions) -> List[dict]:
-    if submission.selftext:
-        text = f"{submission.selftext}"
-    else:
-        text = submission.title
+async def fetch_reddit_json(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, path: str, params: dict):
+    """GET a Reddit JSON endpoint, backing off up to REDDIT_MAX_RETRIES times while rate limited."""
+    for attempt in range(REDDIT_MAX_RETRIES + 1):
+        async with semaphore:
+            response = await client.get(path, params=params)
+        if response.status_code != 429 or attempt == REDDIT_MAX_RETRIES:
+            break
+        try:
+            delay = float(response.headers['retry-after'])
+        except (KeyError, ValueError):
+            delay = REDDIT_SLEEP_TIME
+        logging.warning(f"Hit 429 on {path}, sleeping {delay:.0f}s...")
+        await asyncio.sleep(delay)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+def parse_reddit_submission(submission: dict, subreddit_name: str) -> Optional[dict]:
+    """Build an opinion from the cleaned post body (or title), if usable."""
+    text = submission.get('selftext') or submission.get('title', '')
             
     cleaned_text = clean_text(text)
-    if cleaned_text:
-        opinions.append({
-            'text': cleaned_text,
-            'score': submission.score,
-            'subreddit': subreddit_name,
-            'type': 'post'
-        })
-            
-    # Add top comments (limit to avoid too much data)
-    while True:
-        try:
-            submission.comments.replace_more(limit=REDDIT_COMMENT_LIMIT)
-            break
-        except Exception as e:
-                    if "429" in str(e) or "RATELIMIT" in str(e).upper():
-                        print(f"Hit 429 while fetching comments, sleeping {REDDIT_SLEEP_TIME}s...")
-                        time.sleep(REDDIT_SLEEP_TIME)
-                    else:
-                        raise
-
-    for comment in submission.comments:  # Reduced to 2 comments per post for speed
-        cleaned_comment = clean_text(comment.body)
+    if not cleaned_text:
+        return None
+    return {
+        'text': cleaned_text,
+        'score': submission.get('score', 0),
+        'subreddit': subreddit_name,
+        'type': 'post'
+    }
+
+async def fetch_top_comments(client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                             submission: dict, subreddit_name: str) -> List[dict]:
+    """Fetch and clean the top comments of a submission."""
+    opinions = []
+    listing = await fetch_reddit_json(
+        client, semaphore, f"/comments/{submission['id']}.json",
+        {'sort': 'top', 'limit': REDDIT_COMMENT_LIMIT, 'depth': 1, 'raw_json': 1},
+    )
+    for child in listing[1]['data']['children']:
+        if child['kind'] != 't1':  # Skip "load more comments" stubs
+            continue
+        comment = child['data']
+        cleaned_comment = clean_text(comment.get('body', ''))
         if cleaned_comment:
             opinions.append({
                 'text': cleaned_comment,
-                'score': comment.score,
+                'score': comment.get('score', 0),
                 'subreddit': subreddit_name,
                 'type': 'comment'
             })
+    
+    return opinions
 
+def opinion_key(text: str) -> int:
+    """
+    Hash key used to deduplicate opinions.
+    
+    Hashes the whole case-folded text (clean_text has already collapsed its
+    whitespace), so opinions that differ anywhere are kept apart.
+    """
+    return xxhash.xxh3_64_intdigest(text.lower().encode())
 
-
-def scrape(subreddit_name: str, topic: str, posts_per_subreddit: int) -> List[dict]:
-    """Scrape a single subreddit for opinions on a topic."""
+async def scrape(client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                 subreddit_name: str, topic: str, posts_per_subreddit: int, seen: set,
+                 sort: str = 'relevance', queue: Optional[asyncio.Queue] = None) -> List[dict]:
+    """
+    Scrape a single subreddit for opinions on a topic.
+    
+    Opinions that do not mention the topic, or whose key is already in `seen`,
+    are dropped as they are collected. All scrapers run on the same event loop,
+    so the shared set needs no lock.
+    
+    Post bodies come with the search listing for free, but every comment
+    section is a request of its own, so comments are only fetched while fewer
+    than `posts_per_subreddit` opinions have been collected.
+    
+    The whole scrape is bounded by REDDIT_SCRAPE_TIMEOUT; opinions collected
+    before it expires are still returned.
+    """
     opinions = []
-    MAX_THREADS = 5
     
-    try:
+    def collect(opinion: Optional[dict]):
+        if opinion is None:
+            return
+        key = opinion_key(opinion['text'])
+        if key not in seen and topic in opinion['text']:
+            seen.add(key)
+            opinions.append(opinion)
+            if queue is not None:
+                queue.put_nowait(opinion['text'])
+    
+    async def run():
         logging.info(f"Scraping r/{subreddit_name} for '{topic}'")
-        subreddit = reddit.subreddit(subreddit_name)
-        
-        # Search for posts related to the topic
-        threads = []
-        while True:
-            try:
-                search = subreddit.search(topic, limit=posts_per_subreddit, sort='relevance')
+        listing = await fetch_reddit_json(
+            client, semaphore, f"/r/{subreddit_name}/search.json",
+            {'q': topic, 'limit': posts_per_subreddit, 'sort': sort, 'restrict_sr': 'on', 'raw_json': 1},
+        )
+        submissions = [child['data'] for child in listing['data']['children']]
+    
+        for submission in submissions:
+            collect(parse_reddit_submission(submission, subreddit_name))
+    
+        # Only fields present in the search listing are read, so posts without
+        # comments cost no further request.
+        with_comments = [submission for submission in submissions if submission.get('num_comments')]
+    
+        # Fetch comments one concurrent wave at a time, stopping once the quota is met
+        for start in range(0, len(with_comments), REDDIT_MAX_CONCURRENCY):
+            if len(opinions) >= posts_per_subreddit:
                 break
-            except Exception as e:
-                if "RATELIMIT" in str(e).upper() or "429" in str(e):
-                    logging.warning("Rate limit hit, waiting {REDDIT_SLEEP_TIME}s...")
-                    time.sleep(REDDIT_SLEEP_TIME)  # backoff
-                else:
-                    raise
-            
-        for submission in search:
-            # if submission.title and topic in submission.title
-            opinions.append([])
-            sleep(0.2)
-            threads.append(threading.Thread(target=parse_reddit_submission, args=(submission,subreddit_name, opinions[-1])))
-            threads[-1].start()
-            # if len(threads) > MAX_THREADS:
-            #     for thread in threads:
-            #         thread.join()
-
-
-        for thread in threads:
-            thread.join()
-       
-
-        opinions = [item for sublist in opinions for item in sublist]
+            results = await asyncio.gather(
+                *[fetch_top_comments(client, semaphore, submission, subreddit_name)
+                  for submission in with_comments[start:start + REDDIT_MAX_CONCURRENCY]],
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logging.warning(f"Error fetching comments in r/{subreddit_name}: {result}")
+                    continue
+                for opinion in result:
+                    collect(opinion)
 
+    try:
+        # Bounded as a whole, on top of the per-request retry cap
+        await asyncio.wait_for(run(), REDDIT_SCRAPE_TIMEOUT)
+    except asyncio.TimeoutError:
+        logging.warning(f"Scraping r/{subreddit_name} timed out after {REDDIT_SCRAPE_TIMEOUT}s")
     except Exception as e:
         logging.warning(f"Error scraping r/{subreddit_name}: {e}")
     
-    logging.info(f"Collected {len(opinions)} opinions from r/{subreddit_name}")
+    logging.info(f"Collected {len(opinions)} unique opinions from r/{subreddit_name}")
     return opinions
 
-def scrape_parallel(topic: str, max_posts: int = 50) -> List[dict]:
-    """Scrape Reddit for opinions using parallel processing."""
+async def scrape_parallel(topic: str, max_posts: int = 50, seen: Optional[set] = None,
+                          subreddits: Optional[List[str]] = None, sort: str = 'relevance',
+                          queue: Optional[asyncio.Queue] = None) -> List[dict]:
+    """
+    Scrape Reddit for opinions, overlapping all HTTP requests on the event loop.
+    
+    Pass the same `seen` set to repeated calls to deduplicate across them.
+    `subreddits` defaults to searching r/all; `sort` is Reddit's search order.
+    Each accepted opinion's text is also put on `queue`, if given, as soon as
+    it is collected.
+    """
     start_time = time.time()
     logging.info(f"Starting parallel scraping for topic: {topic}")
     
@@ -272,59 +436,178 @@ def scrape_parallel(topic: str, max_posts: int = 50) -> List[dict]:
     #     'NeutralPolitics', 'unpopularopinion', 
     #     'Ask_Politics', 'AskReddit'
     # ]
-    subreddits = ['all']
+    if subreddits is None:
+        subreddits = ['all']
     
     # posts_per_subreddit = max(3, max_posts // len(subreddits))
     posts_per_subreddit = 100
     all_opinions = []
+    if seen is None:
+        seen = set()
+    
+    semaphore = asyncio.Semaphore(REDDIT_MAX_CONCURRENCY)
+    results = await asyncio.gather(
+        *[scrape(app.state.http, semaphore, subreddit, topic, posts_per_subreddit, seen, sort, queue)
+          for subreddit in subreddits]
+    )
     
+    for opinions in results:
+        all_opinions.extend(opinions)
+    
+    end_time = time.time()
+    logging.info(f"Parallel scraping completed in {end_time - start_time:.2f} seconds")
+    logging.info(f"Collected {len(all_opinions)} unique opinions")
+    
+    return all_opinions
+    # return all_opinions[:max_posts]
 
-    with ThreadPoolExecutor(max_workers=1) as executor:
+async def embed_stream(queue: asyncio.Queue) -> dict:
+    """
+    Encode texts as scrapers put them on `queue`, until a None sentinel arrives.
+    
+    Whatever queued up while the previous batch was encoding becomes the next
+    batch (up to EMBED_BATCH_SIZE), so encoding keeps pace with scraping.
+    
+    Returns:
+        Mapping of each text to its float32 embedding
+    """
+    embedded = {}
+    finished = False
+    while not finished:
+        batch = []
+        text = await queue.get()
+        while text is not None:
+            batch.append(text)
+            if len(batch) >= EMBED_BATCH_SIZE or queue.empty():
+                break
+            text = queue.get_nowait()
+        finished = text is None
+        if batch:
+            vectors = await asyncio.to_thread(encode_texts, batch)
+            embedded.update(zip(batch, vectors))
+    return embedded
 
-        future_to_subreddit = {
-            executor.submit(scrape, subreddit, topic, posts_per_subreddit): subreddit 
-            for subreddit in subreddits
-        }
-        
-        # Collect results as they complete
-        for future in as_completed(future_to_subreddit):
-            subreddit_name = future_to_subreddit[future]
-            try:
-                opinions = future.result(timeout=30)  # 30 second timeout per subreddit
-                all_opinions.extend(opinions)
-            except Exception as e:
-                logging.error(f"Error getting results from r/{subreddit_name}: {e}")
+def embedding_cache_key(text: str) -> tuple:
+    """Key of a text in embedding_cache; includes the model so a model swap never reuses stale vectors."""
+    return (EMBED_MODEL_NAME, xxhash.xxh3_128_hexdigest(text.encode()))
+
+def encode_texts(texts: List[str]) -> np.ndarray:
+    """
+    Encode texts into unit-length float32 embeddings.
     
+    Embeddings are looked up in the on-disk embedding_cache first and only the
+    misses go through the model; new vectors are written back as float16.
+    
+    SentenceTransformer.encode already length-sorts its input before batching
+    and restores the caller's order, so each batch is padded only to similar
+    lengths; that is what makes the larger batch size worthwhile.
+    """
+    keys = [embedding_cache_key(text) for text in texts]
+    cached = [embedding_cache.get(key) for key in keys]
+    miss_idxs = [i for i, vector in enumerate(cached) if vector is None]
+    
+    embeddings = np.empty((len(texts), embed_model.get_sentence_embedding_dimension()), dtype=np.float32)
+    for i, vector in enumerate(cached):
+        if vector is not None:
+            embeddings[i] = vector
+    
+    if miss_idxs:
+        miss_embeddings = embed_model.encode(
+            [texts[i] for i in miss_idxs],
+            batch_size=EMBED_BATCH_SIZE,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+        embeddings[miss_idxs] = miss_embeddings
+        with embedding_cache.transact():
+            for i, vector in zip(miss_idxs, miss_embeddings.astype(np.float16)):
+                embedding_cache[keys[i]] = vector
+    
+    logging.info(f"Embedding cache: {len(texts) - len(miss_idxs)} hits, {len(miss_idxs)} misses")
+    return embeddings
 
-    seen_texts = set()
-    unique_opinions = []
-    for opinion in all_opinions:
-        text_key = opinion['text'][:100]  # Use first 100 chars as key
-        if text_key not in seen_texts and (topic in opinion['text']):
-            seen_texts.add(text_key)
-            unique_opinions.append(opinion)
+def quantize_embeddings(embeddings: np.ndarray):
+    """
+    Quantize embeddings to int8 with one scale per vector.
     
-    end_time = time.time()
-    logging.info(f"Parallel scraping completed in {end_time - start_time:.2f} seconds")
-    logging.info(f"Collected {len(unique_opinions)} unique opinions from {len(all_opinions)} total")
+    Returns:
+        Tuple of (int8 array, float32 scales) where embeddings ~= quantized * scale
+    """
+    scales = np.abs(embeddings).max(axis=1, keepdims=True) / 127
+    quantized = np.round(embeddings / scales).astype(np.int8)
+    return quantized, scales[:, 0]
+
+def pack_embedding(quantized: np.ndarray) -> str:
+    """Base64 wire format of one int8-quantized embedding."""
+    return base64.b64encode(quantized.tobytes()).decode('ascii')
+
+def unpack_embedding(payload: str, scale: float) -> np.ndarray:
+    """
+    Recover the float32 embedding from pack_embedding's output and its scale.
     
-    return unique_opinions
-    # return unique_opinions[:max_posts]
+    Rounding to int8 moves the vector slightly off unit length, so it is
+    re-normalized; otherwise dot-product similarities can exceed 1.
+    """
+    embedding = np.frombuffer(base64.b64decode(payload), dtype=np.int8).astype(np.float32) * scale
+    return embedding / max(np.linalg.norm(embedding), 1e-12)
 
-def create_clusters(embeddings: np.ndarray, method: str = "kmeans", n_clusters: int = 5) -> List[int]:
+def create_similarity_groups(embeddings: np.ndarray, threshold: float = 0.7) -> List[int]:
+    """
+    Group opinions whose cosine similarity is at least `threshold`.
+    
+    Groups are the connected components of the thresholded similarity graph,
+    so similarity is transitive: if A~B and B~C then A, B and C share a group.
+    
+    Args:
+        embeddings: Unit-length embedding vectors, so cosine similarity is a plain dot product
+        threshold: Minimum cosine similarity for two opinions to be linked
+    
+    Returns:
+        List of group labels for each embedding
+    """
+    n_points = len(embeddings)
+    
+    if faiss is not None and n_points > SIMILARITY_DENSE_MAX_POINTS:
+        # Only pairs above the threshold are ever materialized; the range search
+        # results are already in CSR layout (row offsets + neighbor ids)
+        E = np.ascontiguousarray(embeddings, dtype=np.float32)
+        index = faiss.IndexFlatIP(E.shape[1])
+        index.add(E)
+        lims, _, neighbors = index.range_search(E, threshold)
+        adjacency = sp.csr_matrix(
+            (np.ones(len(neighbors), dtype=bool), neighbors, lims),
+            shape=(n_points, n_points),
+        )
+    else:
+        # A single float32 BLAS GEMM
+        S = embeddings @ embeddings.T
+        # The graph is undirected, so the strict upper triangle holds every edge
+        # once and drops the self-loops, halving the CSR built from the matrix
+        adjacency = sp.csr_matrix(np.triu(S >= threshold, k=1))
+    n_groups, labels = connected_components(adjacency, directed=False)
+    logging.info(f"Similarity grouping: {n_groups} groups at threshold {threshold}")
+    return labels.tolist()
+
+def create_clusters(embeddings: np.ndarray, method: str = "kmeans", n_clusters: int = 5,
+                    similarity_threshold: float = 0.7) -> List[int]:
     """
     Create clusters using various clustering methods.
     
     Args:
         embeddings: The embedding vectors
-        method: Clustering method - "kmeans", "hdbscan"
+        method: Clustering method - "kmeans", "hdbscan", "similarity"
         n_clusters: Number of clusters for KMeans (ignored for HDBSCAN)
+        similarity_threshold: Cosine threshold for "similarity" grouping
     
     Returns:
         List of cluster labels for each embedding
     """
     n_points = len(embeddings)
     
+    if method.lower() == "similarity":
+        return create_similarity_groups(embeddings, similarity_threshold)
+    
     if method.lower() == "kmeans":
         # Use KMeans clustering with improved parameters for text
         # Adjust n_clusters if we have fewer points than clusters
@@ -332,6 +615,23 @@ def create_clusters(embeddings: np.ndarray, method: str = "kmeans", n_clusters:
         if actual_clusters < 2:
             return [0] * n_points  # All points in one cluster if too few points
         
+        if faiss is not None:
+            # faiss assigns points with one blocked SGEMM per iteration (on GPU when available)
+            E = np.ascontiguousarray(embeddings, dtype=np.float32)
+            kmeans = faiss.Kmeans(
+                E.shape[1],
+                actual_clusters,
+                niter=50,
+                nredo=5,  # Keep the best of several initializations
+                seed=42,
+                verbose=False,
+                min_points_per_centroid=1,  # Our inputs are far below faiss' 39-per-centroid advice; don't warn
+                gpu=faiss.get_num_gpus() > 0,
+            )
+            kmeans.train(E)
+            _, cluster_labels = kmeans.index.search(E, 1)
+            return cluster_labels.ravel().tolist()
+        
         kmeans = KMeans(
             n_clusters=actual_clusters, 
             random_state=42, 
@@ -343,6 +643,11 @@ def create_clusters(embeddings: np.ndarray, method: str = "kmeans", n_clusters:
         return cluster_labels.tolist()
     
     elif method.lower() == "hdbscan":
+        if n_points < HDBSCAN_MIN_POINTS:
+            # Too few points for density clusters; skip straight to the KMeans fallback
+            logging.info(f"Only {n_points} points, using KMeans instead of HDBSCAN")
+            return create_clusters(embeddings, "kmeans", min(8, max(3, n_points // 20)))
+        
         # Use HDBSCAN clustering with improved parameters for text
         # HDBSCAN automatically determines the number of clusters
         min_cluster_size = max(5, min(25, n_points // 15))  # Scale better with data size
@@ -353,13 +658,15 @@ def create_clusters(embeddings: np.ndarray, method: str = "kmeans", n_clusters:
             cluster_selection_epsilon=0.0,  # Let HDBSCAN decide naturally
             alpha=1.0,  # Better cluster stability
             cluster_selection_method='eom',  # Excess of mass for better text clusters
-            allow_single_cluster=True  # Allow single cluster if data is very similar
+            allow_single_cluster=True,  # Allow single cluster if data is very similar
+            approx_min_span_tree=True,
+            core_dist_n_jobs=-1  # Core distances on all cores
         )
         cluster_labels = clusterer.fit_predict(embeddings)
         
         # If HDBSCAN assigns too many points as noise (-1), fall back to KMeans
         noise_ratio = (cluster_labels == -1).sum() / len(cluster_labels)
-        unique_clusters = len(set(cluster_labels))
+        unique_clusters = len(np.unique(cluster_labels))
         
         logging.info(f"HDBSCAN results: {unique_clusters} clusters, {noise_ratio:.2%} noise")
         
@@ -368,17 +675,8 @@ def create_clusters(embeddings: np.ndarray, method: str = "kmeans", n_clusters:
             return create_clusters(embeddings, "kmeans", min(8, max(3, n_points // 20)))
         
         # Convert noise points (-1) to a separate cluster for visualization
-        cluster_labels_fixed = []
-        max_cluster = max([c for c in cluster_labels if c >= 0], default=0)
-        noise_cluster_id = max_cluster + 1
-        
-        for label in cluster_labels:
-            if label == -1:  # Noise point
-                cluster_labels_fixed.append(noise_cluster_id)
-            else:
-                cluster_labels_fixed.append(label)
-                
-        return cluster_labels_fixed
+        noise_cluster_id = cluster_labels.max() + 1
+        return np.where(cluster_labels == -1, noise_cluster_id, cluster_labels).tolist()
     
     
     else:
@@ -386,6 +684,141 @@ def create_clusters(embeddings: np.ndarray, method: str = "kmeans", n_clusters:
         logging.warning(f"Unknown clustering method '{method}', defaulting to kmeans")
         return create_clusters(embeddings, "kmeans", n_clusters)
 
+def neighbor_graph(embeddings: np.ndarray, k: int) -> tuple:
+    """
+    Exact k-nearest-neighbor graph of unit-length embeddings, cached by their contents.
+    
+    One GEMM gives every pairwise dot product, from which the euclidean distance
+    between unit vectors follows as sqrt(2 - 2 * dot). Row i lists point i itself
+    first, followed by its k - 1 nearest neighbors, as umap-learn expects.
+    
+    Returns:
+        Tuple of (int32 indices, float32 distances), each of shape (n, k)
+    """
+    key = (k, embeddings.shape, xxhash.xxh3_128_hexdigest(embeddings.tobytes()))
+    with knn_cache_lock:
+        graph = knn_cache.get(key)
+    if graph is None:
+        S = embeddings @ embeddings.T
+        np.fill_diagonal(S, np.inf)  # Rank each point first among its own neighbors
+        indices = np.argpartition(-S, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(S, indices, axis=1), axis=1)
+        indices = np.take_along_axis(indices, order, axis=1)
+        similarities = np.take_along_axis(S, indices, axis=1)
+        similarities[:, 0] = 1
+        distances = np.sqrt(np.maximum(2 - 2 * similarities, 0))
+        graph = (indices.astype(np.int32), distances.astype(np.float32))
+        with knn_cache_lock:
+            knn_cache[key] = graph
+    return graph
+
+def reduce_dimensions(embeddings: np.ndarray, method: str = "umap", deterministic: bool = False) -> np.ndarray:
+    """
+    Project embeddings to 2D for visualization.
+    
+    Args:
+        embeddings: The embedding vectors
+        method: Reduction method - "tsne", "umap", "pca" (UMAP needs at least UMAP_MIN_POINTS)
+        deterministic: Seed UMAP for reproducible output at the cost of multi-threading
+    
+    Returns:
+        Array of shape (n, 2) with the 2D coordinates
+    """
+    if method == "tsne":
+        # t-SNE is excellent for text visualization and cluster separation.
+        # openTSNE is multi-threaded and O(n log n); "auto" picks exact neighbors
+        # and Barnes-Hut for small inputs and switches to Annoy + FFT as n grows.
+        n_points = len(embeddings)
+        perplexity = min(30, n_points - 1)
+        reducer = TSNE(
+            n_components=2, 
+            random_state=42, 
+            perplexity=perplexity, 
+            learning_rate='auto',
+            early_exaggeration_iter=250,
+            n_iter=750,  # Same 1000 total iterations as before
+            early_exaggeration=12,
+            metric='euclidean',  # t-SNE works well with euclidean on normalized embeddings
+            initialization='pca',  # Better initialization for text embeddings
+            neighbors='auto',
+            negative_gradient_method='auto',
+            n_jobs=-1,
+        )
+        if n_points > KNN_EXACT_MAX_POINTS:
+            return np.asarray(reducer.fit(embeddings))
+        # The neighbor count openTSNE would pick itself; its neighbor lists exclude the point
+        indices, distances = neighbor_graph(embeddings, min(n_points - 1, 3 * perplexity) + 1)
+        affinities = PerplexityBasedNN(
+            perplexity=perplexity,
+            knn_index=PrecomputedNeighbors(indices[:, 1:], distances[:, 1:]),
+            n_jobs=-1,
+        )
+        return np.asarray(reducer.fit(embeddings, affinities=affinities))
+    elif method == "umap" and len(embeddings) >= UMAP_MIN_POINTS:
+        # Improved UMAP parameters for text clustering; cuML's GPU UMAP is a drop-in when present
+        umap_class = cuUMAP if cuUMAP is not None else umap.UMAP
+        umap_kwargs = dict(
+            n_components=2, 
+            min_dist=0.3,  # Increased for better separation
+            n_neighbors=min(15, len(embeddings)-1),
+            spread=1.5,  # Better spread of clusters
+            metric='euclidean'  # Better for text embeddings
+        )
+        if umap_class is umap.UMAP:
+            umap_kwargs.update(low_memory=True, n_jobs=-1)
+            if len(embeddings) <= KNN_EXACT_MAX_POINTS:
+                # umap-learn skips its own neighbor search when handed the graph
+                indices, distances = neighbor_graph(embeddings, umap_kwargs['n_neighbors'])
+                umap_kwargs['precomputed_knn'] = (indices, distances, None)
+        if deterministic:
+            # A fixed seed forces umap-learn onto a single thread, so only pay for it on request
+            umap_kwargs['random_state'] = 42
+        reducer = umap_class(**umap_kwargs)
+    else:  # PCA, also used for UMAP requests with too few points
+        # Randomized SVD only solves for the 2 requested components instead of the full spectrum
+        reducer = PCA(n_components=2, svd_solver='randomized', random_state=42)
+    
+    return reducer.fit_transform(embeddings)
+
+def _warmup_models():
+    """Run the one-time initialization that would otherwise land on the first request."""
+    start_time = time.time()
+    embed_model.encode(["warmup"] * 4, batch_size=4, show_progress_bar=False)
+    logging.info(f"Embedding model warmed up in {time.time() - start_time:.2f} seconds")
+    
+    if cuUMAP is None:
+        # Large enough to take the precomputed-kNN path real requests take
+        sample = np.random.randn(UMAP_MIN_POINTS, embed_model.get_sentence_embedding_dimension()).astype(np.float32)
+        sample /= np.linalg.norm(sample, axis=1, keepdims=True)
+        start_time = time.time()
+        reduce_dimensions(sample, "umap")
+        logging.info(f"UMAP Numba kernels compiled in {time.time() - start_time:.2f} seconds")
+
+@app.on_event("startup")
+async def _warmup():
+    await asyncio.to_thread(_warmup_models)
+
+@app.on_event("startup")
+async def _open_http_client():
+    # One pooled HTTP/2 client for the whole process, so TLS setup is paid once
+    # and concurrent Reddit requests multiplex over a single connection
+    app.state.http = httpx.AsyncClient(
+        base_url=REDDIT_BASE_URL,
+        http2=True,
+        headers={'User-Agent': REDDIT_USER_AGENT},
+        timeout=10.0,
+        # Keep idle connections warm between requests, so repeat scrapes skip the TLS handshake
+        limits=httpx.Limits(
+            max_connections=REDDIT_MAX_CONNECTIONS,
+            max_keepalive_connections=REDDIT_MAX_KEEPALIVE,
+            keepalive_expiry=REDDIT_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+@app.on_event("shutdown")
+async def _close_http_client():
+    await app.state.http.aclose()
+
 @app.get("/")
 async def root():
     return {"message": "Opinion Visualization API"}
@@ -411,105 +844,145 @@ async def extract_topic(request: TopicExtractionRequest):
         logging.error(f"Error in topic extraction endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def process_cache_key(request: ProcessRequest) -> tuple:
+    """Key identifying a /api/process result in result_cache."""
+    return (
+        request.topic.lower().strip(),
+        request.reduction,
+        request.clustering_method,
+        request.n_clusters,
+        round(request.similarity_threshold or 0.7, 2),
+        request.max_posts,
+        request.include_embeddings,
+        request.deterministic,
+    )
+
 @app.post("/api/process", response_model=dict)
 async def process_topic(request: ProcessRequest):
     try:
+        cache_key = process_cache_key(request)
+        cached_result = result_cache.get(cache_key)
+        if cached_result is not None:
+            logging.info(f"Serving cached result for topic: {request.topic}")
+            return ORJSONResponse(cached_result)
+        
         original_input = request.topic
         
-        # Always try to extract topic using AI first
+        # Always try to extract topic using AI first. While Gemini answers, start
+        # scraping for the keyword heuristic's guess; the two usually agree.
         logging.info(f"Extracting key topic from input: {request.topic}")
+        topic_task = asyncio.create_task(extract_key_topic(request.topic))
+        guessed_topic = extract_topic_fallback(request.topic)
+        
+        # Scraped texts are encoded as they arrive, overlapping the encoder with Reddit I/O
+        embed_queue = asyncio.Queue()
+        embed_task = asyncio.create_task(embed_stream(embed_queue))
+        
+        prefetch_seen = set()
+        prefetch_task = asyncio.create_task(
+            scrape_parallel(guessed_topic, request.max_posts or 50, prefetch_seen, queue=embed_queue)
+        )
         try:
-            extracted_topic = await extract_key_topic(request.topic)
-            logging.info(f"Successfully extracted topic: {extracted_topic}")
-            topic_to_use = extracted_topic
-        except Exception as e:
-            logging.warning(f"Topic extraction failed: {e}. Using original input as topic.")
-            extracted_topic = request.topic  # Fallback to original input
-            topic_to_use = request.topic
-        
-        all_opinions = scrape_parallel(topic_to_use, request.max_posts or 50)
-        
-        if len(all_opinions) < (request.max_posts or 50) // 2:
-            logging.info("Supplementing with standard praw search")
-            standard_opinions = scrape_parallel(topic_to_use, request.max_posts or 50)
-            all_opinions.extend(standard_opinions)
-        
-        # Remove duplicates based on text similarity (first 100 characters)
-        seen_texts = set()
-        unique_opinions = []
-        for opinion in all_opinions:
-            text_key = opinion['text'][:100]
-            if text_key not in seen_texts:
-                seen_texts.add(text_key)
-                unique_opinions.append(opinion)
-        
-        # Limit to max_posts
-        opinions = unique_opinions
-        # opinions = unique_opinions[:request.max_posts or 50]
-        
-        if not opinions:
-            raise HTTPException(status_code=404, detail=f"No opinions found for topic: {extracted_topic}")
+            try:
+                extracted_topic = await topic_task
+                logging.info(f"Successfully extracted topic: {extracted_topic}")
+                topic_to_use = extracted_topic
+            except Exception as e:
+                logging.warning(f"Topic extraction failed: {e}. Using original input as topic.")
+                extracted_topic = request.topic  # Fallback to original input
+                topic_to_use = request.topic
+        
+            # Shared across both searches so opinions are deduplicated as they arrive
+            if topic_to_use == guessed_topic:
+                seen_texts = prefetch_seen
+                all_opinions = await prefetch_task
+            else:
+                logging.info(f"Extracted topic differs from guess '{guessed_topic}', scraping again")
+                prefetch_task.cancel()
+                seen_texts = set()
+                all_opinions = await scrape_parallel(topic_to_use, request.max_posts or 50, seen_texts, queue=embed_queue)
+        
+            if len(all_opinions) < (request.max_posts or 50) // 2:
+                # Repeating the same search returns the same posts, so look at the newest
+                # posts in discussion-heavy subreddits instead
+                logging.info("Supplementing with newest posts from discussion subreddits")
+                supplemental_opinions = await scrape_parallel(
+                    topic_to_use, request.max_posts or 50, seen_texts,
+                    subreddits=SUPPLEMENTAL_SUBREDDITS, sort='new', queue=embed_queue,
+                )
+                all_opinions.extend(supplemental_opinions)
+        
+            # No more texts are coming; let the encoder finish what is queued
+            embed_queue.put_nowait(None)
+        
+            # Limit to max_posts
+            opinions = all_opinions
+            # opinions = all_opinions[:request.max_posts or 50]
+        
+            if not opinions:
+                raise HTTPException(status_code=404, detail=f"No opinions found for topic: {extracted_topic}")
+        
+            # Collect the streamed embeddings; most were encoded while scraping was still running
+            logging.info(f"Waiting for the remaining embeddings of {len(opinions)} texts...")
+            start_time = time.time()
+            embedded = await embed_task
+        finally:
+            # A stream that never gets its sentinel would wait on the queue forever, so
+            # nothing started above may outlive the request, even when it fails or is cancelled
+            pending = (topic_task, prefetch_task, embed_task)
+            for task in pending:
+                task.cancel()  # No-op for tasks that already finished
+            await asyncio.gather(*pending, return_exceptions=True)
         
         # Extract texts for embedding
         texts = [opinion['text'] for opinion in opinions]
         
-        # Generate embeddings with progress logging
-        logging.info(f"Generating embeddings for {len(texts)} texts...")
-        start_time = time.time()
-        embeddings = model.encode(texts, show_progress_bar=False, batch_size=32)
+        # One contiguous float32 host buffer feeds clustering, reduction and quantization,
+        # so none of them makes its own copy
+        embeddings = np.ascontiguousarray(np.stack([embedded[text] for text in texts]), dtype=np.float32)
         embed_time = time.time() - start_time
-        logging.info(f"Embeddings generated in {embed_time:.2f} seconds")
+        logging.info(f"Embeddings ready {embed_time:.2f} seconds after scraping finished")
         
-        # Create clusters
+        # Create clusters; CPU-bound stages run in worker threads so other requests keep being served
         logging.info(f"Creating clusters using {request.clustering_method} method")
-        cluster_labels = create_clusters(
+        cluster_labels = await asyncio.to_thread(
+            create_clusters,
             embeddings, 
             method=request.clustering_method or "kmeans",
             n_clusters=request.n_clusters or 5,
+            similarity_threshold=request.similarity_threshold or 0.7,
         )
         
         # Dimensionality reduction
         logging.info(f"Applying {request.reduction} dimensionality reduction...")
-        if request.reduction == "tsne":
-            # t-SNE is excellent for text visualization and cluster separation
-            reducer = TSNE(
-                n_components=2, 
-                random_state=42, 
-                perplexity=min(30, len(embeddings)-1), 
-                learning_rate='auto',
-                max_iter=1000,
-                early_exaggeration=12,
-                metric='euclidean',  # t-SNE works well with euclidean on normalized embeddings
-                init='pca'  # Better initialization for text embeddings
-            )
-        elif request.reduction == "umap":
-            # Improved UMAP parameters for text clustering
-            reducer = umap.UMAP(
-                n_components=2, 
-                random_state=42, 
-                min_dist=0.3,  # Increased for better separation
-                n_neighbors=min(15, len(embeddings)-1),
-                spread=1.5,  # Better spread of clusters
-                metric='euclidean'  # Better for text embeddings
-            )
-        else:  # PCA
-            reducer = PCA(n_components=2, random_state=42)
+        coords_2d = await asyncio.to_thread(
+            reduce_dimensions, embeddings, request.reduction, bool(request.deterministic)
+        )
         
-        coords_2d = reducer.fit_transform(embeddings)
+        # Convert coordinate columns at once; ndarray.tolist() yields Python floats in C
+        xs, ys = coords_2d[:, 0].tolist(), coords_2d[:, 1].tolist()
+        if request.include_embeddings:
+            quantized, scales = quantize_embeddings(embeddings)
+            point_embeddings = [pack_embedding(row) for row in quantized]
+            point_scales = scales.tolist()
+        else:
+            point_embeddings = point_scales = [None] * len(opinions)
         
-        points = []
-        for i, (opinion, coords, embedding) in enumerate(zip(opinions, coords_2d, embeddings)):
-            point_dict = {
+        points = [
+            {
                 "id": i,
-                "x": float(coords[0]),
-                "y": float(coords[1]),
+                "x": x,
+                "y": y,
                 "text": opinion['text'],
-                "cluster": int(cluster_labels[i]),  
+                "cluster": cluster,
                 "score": opinion.get('score', 0),
                 "subreddit": opinion.get('subreddit', 'unknown'),
-                "embedding": embedding.tolist()[:50] 
+                "embedding": embedding,
+                "embedding_scale": scale
             }
-            points.append(point_dict)
+            for i, (opinion, x, y, cluster, embedding, scale)
+            in enumerate(zip(opinions, xs, ys, cluster_labels, point_embeddings, point_scales))
+        ]
         
         # Log cluster distribution for debugging
         from collections import Counter
@@ -517,7 +990,7 @@ async def process_topic(request: ProcessRequest):
         logging.info(f"Successfully processed {len(points)} points with {len(set(cluster_labels))} clusters")
         logging.info(f"Cluster distribution: {dict(cluster_counts)}")
         
-        return {
+        result = {
             "points": points,
             "original_input": original_input,
             "extracted_topic": extracted_topic,
@@ -528,6 +1001,8 @@ async def process_topic(request: ProcessRequest):
             "total_opinions": len(opinions),
             "total_clusters": len(set(cluster_labels))
         }
+        result_cache[cache_key] = result
+        return ORJSONResponse(result)
         
     except Exception as e:
         logging.error(f"Error processing request: {e}")
@@ -547,22 +1022,43 @@ async def add_user_stance(request: UserStanceRequest):
         if not request.existing_points:
             raise HTTPException(status_code=400, detail="No existing points provided for positioning")
         
-        # Generate embedding for user statement
-        user_embedding = model.encode([request.user_statement.strip()])[0]
+        # Generate embedding for user statement; encoding runs in a worker thread so
+        # other requests keep being served
+        user_embedding = (await asyncio.to_thread(
+            embed_model.encode,
+            [request.user_statement.strip()], convert_to_numpy=True, normalize_embeddings=True,
+        ))[0].astype(np.float32)
         
         # Extract embeddings from existing points
-        existing_embeddings = []
-        for point in request.existing_points:
-            if point.embedding:
-                existing_embeddings.append(point.embedding)
+        embedding_dim = embed_model.get_sentence_embedding_dimension()
+        existing_embeddings = np.empty((len(request.existing_points), embedding_dim), dtype=np.float32)
+        missing_idx = []
+        for i, point in enumerate(request.existing_points):
+            embedding = None
+            if point.embedding and point.embedding_scale is not None:
+                try:
+                    embedding = unpack_embedding(point.embedding, point.embedding_scale)
+                except (binascii.Error, ValueError):
+                    pass  # Malformed payload; re-encoded below like a missing one
+            if embedding is None or embedding.shape[0] != embedding_dim:
+                missing_idx.append(i)
             else:
-                # If no embedding stored, regenerate it
-                existing_embeddings.append(model.encode([point.text])[0])
+                existing_embeddings[i] = embedding
+        
+        if missing_idx:
+            # Points without a usable stored embedding are regenerated (or loaded from the
+            # embedding cache) in one batched call
+            existing_embeddings[missing_idx] = await asyncio.to_thread(
+                encode_texts, [request.existing_points[i].text for i in missing_idx]
+            )
         
-        existing_embeddings = np.array(existing_embeddings)
+        # Point coordinates as arrays, read once
+        n_points = len(request.existing_points)
+        xs = np.fromiter((point.x for point in request.existing_points), dtype=np.float64, count=n_points)
+        ys = np.fromiter((point.y for point in request.existing_points), dtype=np.float64, count=n_points)
         
-        # Calculate similarities
-        similarities = cosine_similarity([user_embedding], existing_embeddings)[0]
+        # Calculate similarities; embeddings are unit-length, so cosine is a single matrix-vector product
+        similarities = existing_embeddings @ user_embedding
         
         # Find the most similar point for positioning reference
         most_similar_idx = np.argmax(similarities)
@@ -572,21 +1068,22 @@ async def add_user_stance(request: UserStanceRequest):
         # Use points with similarity > 0.5 for positioning
         similar_points_mask = similarities > 0.5
         
-        if np.sum(similar_points_mask) > 0:
+        if similar_points_mask.any():
             # Weighted average position based on similarity
             weights = similarities[similar_points_mask]
-            weighted_x = np.average([request.existing_points[i].x for i in range(len(request.existing_points)) if similar_points_mask[i]], weights=weights)
-            weighted_y = np.average([request.existing_points[i].y for i in range(len(request.existing_points)) if similar_points_mask[i]], weights=weights)
+            weighted_x = np.average(xs[similar_points_mask], weights=weights)
+            weighted_y = np.average(ys[similar_points_mask], weights=weights)
         else:
             # If no similar points, use the most similar one as reference
-            weighted_x = request.existing_points[most_similar_idx].x
-            weighted_y = request.existing_points[most_similar_idx].y
+            weighted_x = xs[most_similar_idx]
+            weighted_y = ys[most_similar_idx]
         
         # Add some jitter to avoid exact overlap
         jitter_x = np.random.normal(0, 0.05)  # Small random offset
         jitter_y = np.random.normal(0, 0.05)
         
         # Create user stance point
+        user_quantized, user_scale = quantize_embeddings(user_embedding[np.newaxis, :])
         user_point = Point(
             id=len(request.existing_points),
             x=float(weighted_x + jitter_x),
@@ -595,30 +1092,32 @@ async def add_user_stance(request: UserStanceRequest):
             cluster=request.existing_points[most_similar_idx].cluster,  # Assign to most similar cluster
             score=None,  # User stances don't have Reddit scores
             subreddit="Your Stance",
-            embedding=user_embedding.tolist(),
+            embedding=pack_embedding(user_quantized[0]),
+            embedding_scale=float(user_scale[0]),
             is_user_stance=True,
             similarity_to_user=1.0  # Self-similarity is 1.0
         )
         
-        # Update similarities for existing points
-        updated_points = []
-        for i, point in enumerate(request.existing_points):
-            updated_point = point.model_copy()
-            updated_point.similarity_to_user = float(similarities[i])
-            updated_points.append(updated_point)
+        # Update similarities for existing points; they were validated on the way in,
+        # so model_construct copies the fields without validating them again
+        updated_points = [
+            Point.model_construct(**{**point.__dict__, 'similarity_to_user': similarity})
+            for point, similarity in zip(request.existing_points, similarities.tolist())
+        ]
         
         # Add user point to the list
         updated_points.append(user_point)
         
         logging.info(f"User stance positioned at ({weighted_x:.3f}, {weighted_y:.3f}) with max similarity {max_similarity:.3f}")
         
-        return {
+        # Returned directly so NumPy scalars go straight to orjson instead of through jsonable_encoder
+        return ORJSONResponse({
             "points": [point.model_dump() for point in updated_points],
-            "user_stance_similarity": float(max_similarity),
+            "user_stance_similarity": max_similarity,
             "most_similar_opinion": request.existing_points[most_similar_idx].text[:100] + "...",
-            "similar_points_count": int(np.sum(similar_points_mask)),
+            "similar_points_count": np.count_nonzero(similar_points_mask),
             "topic": request.topic
-        }
+        })
         
     except Exception as e:
         logging.error(f"Error adding user stance: {e}")